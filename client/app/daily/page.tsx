@@ -5,6 +5,7 @@ import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Search, TrendingUp, TrendingDown, Minus, Calendar, BarChart3, Activity } from 'lucide-react'
+import { fetchApi } from '@/lib/api'
 
 interface StockData {
   日期: string
@@ -55,8 +56,7 @@ export default function DailyPage() {
         ? `http://localhost:8000/stock/daily/${stockCode.trim()}?date=${date}`
         : `http://localhost:8000/stock/daily/${stockCode.trim()}`
 
-      const response = await fetch(url)
-      const data: ApiResponse = await response.json()
+      const data = await fetchApi<ApiResponse>(url)
 
       if (data.code === '200') {
         setStockData(data.data.stock_data)
@@ -5,6 +5,7 @@ import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Search, TrendingUp, TrendingDown, Minus, BarChart3, Calendar, PieChart, Activity } from 'lucide-react'
+import { fetchApi } from '@/lib/api'
 
 interface StockData {
   日期: string
@@ -51,8 +52,7 @@ export default function MonthlyPage() {
     setStockData([])
 
     try {
-      const response = await fetch(`http://localhost:8000/stock/monthly/${stockCode.trim()}`)
-      const data: ApiResponse = await response.json()
+      const data = await fetchApi<ApiResponse>(`http://localhost:8000/stock/monthly/${stockCode.trim()}`)
 
       if (data.code === '200') {
         setStockData(data.data.stock_data)
@@ -5,6 +5,7 @@ import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Search, TrendingUp, TrendingDown, Minus, Clock, BarChart3, Activity, RefreshCw, Zap } from 'lucide-react'
+import { fetchApi } from '@/lib/api'
 
 interface MinuteData {
   时间: string
@@ -60,8 +61,7 @@ export default function RealtimePage() {
     setError('')
 
     try {
-      const response = await fetch(`http://localhost:8000/stock/realtime/${stockCode.trim()}`)
-      const data: ApiResponse = await response.json()
+      const data = await fetchApi<ApiResponse>(`http://localhost:8000/stock/realtime/${stockCode.trim()}`)
 
       if (data.code === '200') {
         setMinuteData(data.data.minute_data)
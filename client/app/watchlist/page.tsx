@@ -5,6 +5,7 @@ import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
 import { Star, Plus, Trash2, RefreshCw, TrendingUp, TrendingDown } from 'lucide-react'
+import { fetchApi } from '@/lib/api'
 
 interface StockInfo {
   stock_code: string
@@ -29,8 +30,7 @@ export default function WatchlistPage() {
   // 获取自选股票列表
   const fetchWatchlist = useCallback(async () => {
     try {
-      const response = await fetch('http://localhost:8000/watchlist/list')
-      const data = await response.json()
+      const data = await fetchApi<any>('http://localhost:8000/watchlist/list')
       if (data.code === '200' && data.data) {
         setStocks(data.data.map((stock: any) => ({
           stock_code: stock.stock_code,
@@ -52,8 +52,7 @@ export default function WatchlistPage() {
   const fetchStocksInfo = useCallback(async () => {
     try {
       setIsRefreshing(true)
-      const response = await fetch('http://localhost:8000/watchlist/stocks/info')
-      const data = await response.json()
+      const data = await fetchApi<any>('http://localhost:8000/watchlist/stocks/info')
       if (data.code === '200' && data.data?.stocks) {
         setStocks(data.data.stocks)
       }
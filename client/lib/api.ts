@@ -0,0 +1,52 @@
+import { decodeMsgpack } from '@/lib/msgpack'
+
+const MSGPACK_MEDIA_TYPE = 'application/x-msgpack'
+
+interface ColumnarData {
+  __columnar__: true
+  columns: string[]
+  values: unknown[][]
+}
+
+const isColumnar = (value: unknown): value is ColumnarData =>
+  typeof value === 'object' && value !== null && (value as ColumnarData).__columnar__ === true
+
+// 将后端的列式数据还原为记录数组，页面仍按 [{日期, 开盘, ...}] 使用
+function fromColumnar(value: unknown): unknown {
+  if (isColumnar(value)) {
+    const { columns, values } = value
+    const length = values.length > 0 ? values[0].length : 0
+    const rows = new Array(length)
+    for (let i = 0; i < length; i++) {
+      const row: Record<string, unknown> = {}
+      for (let j = 0; j < columns.length; j++) {
+        row[columns[j]] = values[j][i]
+      }
+      rows[i] = row
+    }
+    return rows
+  }
+  if (Array.isArray(value)) {
+    return value.map(fromColumnar)
+  }
+  if (typeof value === 'object' && value !== null) {
+    const result: Record<string, unknown> = {}
+    for (const key of Object.keys(value)) {
+      result[key] = fromColumnar((value as Record<string, unknown>)[key])
+    }
+    return result
+  }
+  return value
+}
+
+// 请求 /stock/* 与 /watchlist/* 接口，优先使用MessagePack列式格式，服务端不支持时回退为JSON
+export async function fetchApi<T>(url: string, init?: RequestInit): Promise<T> {
+  const headers = new Headers(init?.headers)
+  headers.set('Accept', `${MSGPACK_MEDIA_TYPE}, application/json;q=0.9`)
+  const response = await fetch(url, { ...init, headers })
+
+  if (response.headers.get('content-type')?.startsWith(MSGPACK_MEDIA_TYPE)) {
+    return fromColumnar(decodeMsgpack(await response.arrayBuffer())) as T
+  }
+  return response.json()
+}
@@ -0,0 +1,103 @@
+// 精简的MessagePack解码器，覆盖后端 msgpack.packb 输出的类型（nil/bool/int/float/str/bin/array/map）
+
+const textDecoder = new TextDecoder()
+
+export function decodeMsgpack(buffer: ArrayBuffer): unknown {
+  const bytes = new Uint8Array(buffer)
+  const view = new DataView(buffer)
+  let offset = 0
+
+  const readStr = (length: number): string => {
+    const value = textDecoder.decode(bytes.subarray(offset, offset + length))
+    offset += length
+    return value
+  }
+
+  const readBin = (length: number): Uint8Array => {
+    const value = bytes.slice(offset, offset + length)
+    offset += length
+    return value
+  }
+
+  const readArray = (length: number): unknown[] => {
+    const result = new Array(length)
+    for (let i = 0; i < length; i++) {
+      result[i] = read()
+    }
+    return result
+  }
+
+  const readMap = (length: number): Record<string, unknown> => {
+    const result: Record<string, unknown> = {}
+    for (let i = 0; i < length; i++) {
+      const key = String(read())
+      result[key] = read()
+    }
+    return result
+  }
+
+  const readUint = (size: 1 | 2 | 4 | 8): number => {
+    let value: number
+    if (size === 1) value = view.getUint8(offset)
+    else if (size === 2) value = view.getUint16(offset)
+    else if (size === 4) value = view.getUint32(offset)
+    else value = view.getUint32(offset) * 4294967296 + view.getUint32(offset + 4)
+    offset += size
+    return value
+  }
+
+  const readInt = (size: 1 | 2 | 4 | 8): number => {
+    let value: number
+    if (size === 1) value = view.getInt8(offset)
+    else if (size === 2) value = view.getInt16(offset)
+    else if (size === 4) value = view.getInt32(offset)
+    else value = view.getInt32(offset) * 4294967296 + view.getUint32(offset + 4)
+    offset += size
+    return value
+  }
+
+  function read(): unknown {
+    const byte = bytes[offset++]
+    if (byte <= 0x7f) return byte
+    if (byte <= 0x8f) return readMap(byte & 0x0f)
+    if (byte <= 0x9f) return readArray(byte & 0x0f)
+    if (byte <= 0xbf) return readStr(byte & 0x1f)
+    if (byte >= 0xe0) return byte - 0x100
+
+    let value: number
+    switch (byte) {
+      case 0xc0: return null
+      case 0xc2: return false
+      case 0xc3: return true
+      case 0xc4: return readBin(readUint(1))
+      case 0xc5: return readBin(readUint(2))
+      case 0xc6: return readBin(readUint(4))
+      case 0xca:
+        value = view.getFloat32(offset)
+        offset += 4
+        return value
+      case 0xcb:
+        value = view.getFloat64(offset)
+        offset += 8
+        return value
+      case 0xcc: return readUint(1)
+      case 0xcd: return readUint(2)
+      case 0xce: return readUint(4)
+      case 0xcf: return readUint(8)
+      case 0xd0: return readInt(1)
+      case 0xd1: return readInt(2)
+      case 0xd2: return readInt(4)
+      case 0xd3: return readInt(8)
+      case 0xd9: return readStr(readUint(1))
+      case 0xda: return readStr(readUint(2))
+      case 0xdb: return readStr(readUint(4))
+      case 0xdc: return readArray(readUint(2))
+      case 0xdd: return readArray(readUint(4))
+      case 0xde: return readMap(readUint(2))
+      case 0xdf: return readMap(readUint(4))
+    }
+    throw new Error(`不支持的MessagePack类型: 0x${byte.toString(16)}`)
+  }
+
+  return read()
+}
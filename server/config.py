@@ -29,6 +29,12 @@ class Config:
     ENABLE_CACHE: bool = os.getenv("ENABLE_CACHE", "False").lower() == "true"
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # 5分钟
     
+    # 响应编码配置（/stock/* 与 /watchlist/* 支持压缩及MessagePack列式格式）
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # 字节，小于该值不压缩
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", "6"))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", "5"))
+    ENCODED_PATH_PREFIXES: tuple = ("/stock/", "/watchlist/")
+    
     # 安全配置
     ALLOW_ORIGINS: list = ["*"]  # CORS允许的源
     ALLOW_CREDENTIALS: bool = True
@@ -1,15 +1,33 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+from contextvars import ContextVar
 import akshare as ak
 import pandas as pd
 from datetime import datetime, timedelta
 import logging
 import sqlite3
 import os
+import gzip
+import json
 from config import config
 
+# 可选依赖：未安装时对应的编码格式不可用
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
 # 配置日志
 logging.basicConfig(
     level=getattr(logging, config.LOG_LEVEL),
@@ -134,13 +152,125 @@ def get_stock_name(stock_code: str) -> str:
         logger.warning(f"获取股票 {stock_code} 名称失败: {str(e)}")
         return stock_code
 
+def parse_header_weights(header_value: str) -> Dict[str, float]:
+    """解析Accept/Accept-Encoding请求头，返回 取值 -> q权重 的映射（取值与参数名均不区分大小写）"""
+    weights = {}
+    for part in header_value.split(","):
+        fields = [field.strip() for field in part.split(";")]
+        token = fields[0].lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        weights[token] = q
+    return weights
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    根据Accept请求头选择响应格式
+    
+    msgpack权重高于JSON时返回msgpack；权重相同时，显式列出的msgpack优先于
+    通配符（*/*、application/*）匹配到的JSON，显式列出的JSON优先于msgpack
+    """
+    if msgpack is None or not accept:
+        return "application/json"
+    weights = parse_header_weights(accept)
+    msgpack_q = weights.get(MSGPACK_MEDIA_TYPE, 0.0)
+    if msgpack_q <= 0:
+        return "application/json"
+    if "application/json" in weights:
+        json_q = weights["application/json"]
+        return MSGPACK_MEDIA_TYPE if msgpack_q > json_q else "application/json"
+    json_q = weights.get("application/*", weights.get("*/*", 0.0))
+    return MSGPACK_MEDIA_TYPE if msgpack_q >= json_q else "application/json"
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    根据Accept-Encoding请求头选择压缩算法，返回 "br"、"gzip" 或 None（不压缩）
+    
+    未显式列出的算法使用 * 的权重；权重相同时优先brotli；
+    identity（不压缩）权重更高时不压缩
+    """
+    weights = parse_header_weights(accept_encoding)
+    wildcard_q = weights.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = weights.get(encoding, wildcard_q)
+        if q > best_q:
+            best, best_q = encoding, q
+    identity_q = weights.get("identity", wildcard_q if "*" in weights else 1.0)
+    if best is None or identity_q > best_q:
+        return None
+    return best
+
+def to_columnar(value: Any) -> Any:
+    """
+    将记录列表递归转换为列式结构，避免每行重复中文列名
+    
+    字段相同的 [{"日期": ..., "开盘": ...}, ...] 转换为
+    {"__columnar__": True, "columns": ["日期", "开盘"], "values": [[日期...], [开盘...]]}，
+    客户端通过 __columnar__ 标记区分列式数据与普通对象
+    """
+    if isinstance(value, dict):
+        return {key: to_columnar(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value):
+            columns = list(value[0].keys())
+            if all(list(item.keys()) == columns for item in value):
+                return {
+                    "__columnar__": True,
+                    "columns": columns,
+                    "values": [[item[column] for item in value] for column in columns]
+                }
+        return [to_columnar(item) for item in value]
+    return value
+
+# 当前请求协商得到的响应格式，由 encode_response 中间件设置，供 NegotiatedResponse 渲染时读取
+negotiated_media_type: ContextVar[str] = ContextVar("negotiated_media_type", default="application/json")
+
+class NegotiatedResponse(JSONResponse):
+    """按内容协商结果渲染响应：msgpack请求直接由接口返回的数据打包，无需先编码再解析JSON"""
+    
+    def render(self, content: Any) -> bytes:
+        if negotiated_media_type.get() == MSGPACK_MEDIA_TYPE:
+            self.media_type = MSGPACK_MEDIA_TYPE
+            return msgpack.packb(to_columnar(content), use_bin_type=True)
+        return super().render(content)
+
+def encode_body(body: bytes, media_type: str, content_type: str, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """
+    对响应体进行编码，返回 (编码后的响应体, Content-Encoding)
+    
+    CPU密集，由中间件放到线程池中执行。未经 NegotiatedResponse 渲染的JSON响应
+    （如HTTPException错误响应）在请求msgpack时需先解析JSON再打包，这类响应体通常很小
+    """
+    if media_type == MSGPACK_MEDIA_TYPE and content_type == "application/json":
+        body = msgpack.packb(to_columnar(json.loads(body)), use_bin_type=True)
+    
+    encoding = None
+    if len(body) >= config.COMPRESSION_MIN_SIZE:
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding == "br":
+            body = brotli.compress(body, quality=config.BROTLI_QUALITY)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=config.GZIP_LEVEL)
+    return body, encoding
+
 # 启动时初始化数据库
 init_database()
 
 app = FastAPI(
     title=config.API_TITLE,
     description=config.API_DESCRIPTION,
-    version=config.API_VERSION
+    version=config.API_VERSION,
+    default_response_class=NegotiatedResponse
 )
 
 # 添加CORS中间件
@@ -152,6 +282,52 @@ app.add_middleware(
     allow_headers=config.ALLOW_HEADERS,
 )
 
+@app.middleware("http")
+async def encode_response(request: Request, call_next):
+    """
+    对 /stock/* 与 /watchlist/* 的响应进行内容协商：
+    - Accept 中 application/x-msgpack 权重最高时返回MessagePack列式格式
+    - Accept-Encoding 中 br/gzip（含 *）权重最高且响应体超过阈值时进行压缩
+    """
+    if not request.url.path.startswith(config.ENCODED_PATH_PREFIXES):
+        return await call_next(request)
+    
+    media_type = negotiate_media_type(request.headers.get("accept", ""))
+    token = negotiated_media_type.set(media_type)
+    try:
+        response = await call_next(request)
+    finally:
+        negotiated_media_type.reset(token)
+    
+    content_type = response.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in ("application/json", MSGPACK_MEDIA_TYPE) or "content-encoding" in response.headers:
+        return response
+    
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    body, encoding = await run_in_threadpool(
+        encode_body, body, media_type, content_type, request.headers.get("accept-encoding", "")
+    )
+    
+    headers = {
+        key: value for key, value in response.headers.items()
+        if key not in ("content-length", "content-type", "vary")
+    }
+    if encoding is not None:
+        headers["content-encoding"] = encoding
+    
+    vary = [value.strip() for value in response.headers.get("vary", "").split(",") if value.strip()]
+    for value in ("Accept", "Accept-Encoding"):
+        if value not in vary:
+            vary.append(value)
+    headers["vary"] = ", ".join(vary)
+    
+    return Response(
+        content=body,
+        status_code=response.status_code,
+        headers=headers,
+        media_type=media_type
+    )
+
 class StockResponse(BaseModel):
     code: str
     message: str
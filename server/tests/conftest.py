@@ -0,0 +1,23 @@
+"""
+测试公共配置：将server目录加入导入路径，并在临时目录中导入main，避免改动仓库中的stock_pool.db
+"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVER_DIR)
+
+
+@pytest.fixture(scope="session")
+def main_module(tmp_path_factory):
+    """导入main模块（导入时会在当前目录初始化数据库）"""
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("db"))
+    try:
+        return importlib.import_module("main")
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,174 @@
+"""
+/stock/* 与 /watchlist/* 响应压缩及MessagePack列式格式测试
+"""
+
+import gzip
+import json
+from datetime import date, timedelta
+
+import brotli
+import msgpack
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+MONTHLY_URL = "/stock/monthly/000001"
+
+
+def make_history(rows: int) -> pd.DataFrame:
+    """构造与 ak.stock_zh_a_hist 返回结构一致的日线数据"""
+    start = date(2024, 1, 1)
+    return pd.DataFrame([
+        {
+            "日期": start + timedelta(days=i),
+            "股票代码": "000001",
+            "开盘": round(10 + i * 0.01, 2),
+            "收盘": round(10.2 + i * 0.01, 2),
+            "最高": round(10.5 + i * 0.01, 2),
+            "最低": round(9.8 + i * 0.01, 2),
+            "成交量": 100000 + i * 37,
+            "成交额": 1000000.0 + i * 371,
+            "振幅": 3.5,
+            "涨跌幅": 1.2,
+            "涨跌额": 0.12,
+            "换手率": 0.85,
+        }
+        for i in range(rows)
+    ])
+
+
+@pytest.fixture
+def client(main_module):
+    return TestClient(main_module.app)
+
+
+@pytest.fixture
+def history(main_module, monkeypatch):
+    """替换akshare日线接口，返回指定行数的数据"""
+    def set_rows(rows: int):
+        data = make_history(rows)
+        monkeypatch.setattr(main_module.ak, "stock_zh_a_hist", lambda **kwargs: data)
+    set_rows(200)
+    return set_rows
+
+
+def get_json(client, url, **headers):
+    return client.get(url, headers={"accept-encoding": "identity", **headers})
+
+
+@pytest.mark.parametrize("encoding, decompress", [
+    ("gzip", gzip.decompress),
+    ("br", brotli.decompress),
+])
+def test_compression_round_trips_to_identical_json(client, history, encoding, decompress):
+    plain = get_json(client, MONTHLY_URL)
+    # httpx会自动解压，这里读取原始字节流以校验实际传输的数据
+    with client.stream("GET", MONTHLY_URL, headers={"accept-encoding": encoding}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["content-type"] == "application/json"
+    assert len(raw) < len(plain.content) / 5
+    assert decompress(raw) == plain.content
+
+
+def test_small_body_is_not_compressed(client, history, main_module):
+    history(1)
+    response = client.get(MONTHLY_URL, headers={"accept-encoding": "gzip, br"})
+
+    assert len(response.content) < main_module.config.COMPRESSION_MIN_SIZE
+    assert "content-encoding" not in response.headers
+    assert response.json()["data"]["total_records"] == 1
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("*", "br"),
+    ("gzip;Q=0", None),
+    ("gzip;q=0.5, identity", None),
+    ("", None),
+])
+def test_encoding_follows_q_values(client, history, accept_encoding, expected):
+    response = client.get(MONTHLY_URL, headers={"accept-encoding": accept_encoding})
+
+    assert response.headers.get("content-encoding") == expected
+
+
+def test_msgpack_decodes_to_columnar_layout(client, history):
+    plain = get_json(client, MONTHLY_URL).json()
+    response = get_json(client, MONTHLY_URL, accept="application/x-msgpack")
+
+    assert response.headers["content-type"] == "application/x-msgpack"
+    payload = msgpack.unpackb(response.content)
+    stock_data = payload["data"]["stock_data"]
+    rows = plain["data"]["stock_data"]
+    assert stock_data["__columnar__"] is True
+    assert stock_data["columns"] == list(rows[0].keys())
+    assert stock_data["values"] == [[row[column] for row in rows] for column in stock_data["columns"]]
+    assert payload["data"]["total_records"] == plain["data"]["total_records"]
+
+
+def test_msgpack_with_brotli_is_much_smaller_than_json(client, history):
+    plain = get_json(client, MONTHLY_URL)
+    with client.stream("GET", MONTHLY_URL, headers={
+        "accept": "application/x-msgpack",
+        "accept-encoding": "br",
+    }) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["content-encoding"] == "br"
+    assert len(raw) < len(plain.content) / 10
+    assert msgpack.unpackb(brotli.decompress(raw))["data"]["stock_data"]["__columnar__"] is True
+
+
+@pytest.mark.parametrize("accept, expected", [
+    ("application/json, application/x-msgpack;q=0.1", "application/json"),
+    ("application/x-msgpack, application/json;q=0.9", "application/x-msgpack"),
+    ("application/x-msgpack, */*", "application/x-msgpack"),
+    ("application/x-msgpack;q=0.1, */*", "application/json"),
+    ("application/x-msgpack;Q=0", "application/json"),
+])
+def test_media_type_follows_q_values(client, history, accept, expected):
+    response = get_json(client, MONTHLY_URL, accept=accept)
+
+    assert response.headers["content-type"] == expected
+
+
+@pytest.mark.parametrize("url", ["/health", "/"])
+def test_non_data_endpoints_are_untouched(client, main_module, monkeypatch, url):
+    monkeypatch.setattr(main_module.config, "COMPRESSION_MIN_SIZE", 0)
+    response = client.get(url, headers={
+        "accept": "application/x-msgpack",
+        "accept-encoding": "gzip, br",
+    })
+
+    assert response.headers["content-type"] == "application/json"
+    assert "content-encoding" not in response.headers
+    assert "Accept" not in response.headers.get("vary", "")
+    assert response.json()["code"] == "200"
+
+
+def test_error_response_is_encoded(client, main_module, monkeypatch):
+    monkeypatch.setattr(main_module.config, "COMPRESSION_MIN_SIZE", 0)
+    url = "/stock/monthly/abc"
+
+    with client.stream("GET", url, headers={"accept-encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.status_code == 500
+    assert response.headers["content-encoding"] == "gzip"
+    detail = json.loads(gzip.decompress(raw))["detail"]
+    assert "股票代码必须为数字" in detail
+
+    response = get_json(client, url, accept="application/x-msgpack")
+    assert response.status_code == 500
+    assert response.headers["content-type"] == "application/x-msgpack"
+    assert msgpack.unpackb(response.content) == {"detail": detail}
+
+
+def test_vary_is_merged_with_cors_origin(client, history):
+    response = get_json(client, MONTHLY_URL, origin="http://localhost:8001")
+
+    assert response.headers["access-control-allow-origin"] == "http://localhost:8001"
+    vary = [value.strip() for value in response.headers["vary"].split(",")]
+    assert vary == ["Origin", "Accept", "Accept-Encoding"]